@@ -1,23 +1,58 @@
+import inspect
 import itertools
 # evaluation functions for genetic programming in Boolean logic domain
-def evaluate_truth_table(program_str, variables):    
+def default_target(*args):
+    return sum(args) == 1
+
+try:
+    popcount = int.bit_count  # Python 3.10+
+except AttributeError:
+    def popcount(x):
+        return bin(x).count('1')
+
+def check_target(target, n_variables):
+    """Raise ValueError if target cannot score programs over n_variables:
+    a callable must accept one argument per variable, a column needs one
+    entry per truth-table row."""
+    if target is None:
+        return
+    if callable(target):
+        try:
+            signature = inspect.signature(target)
+        except ValueError:
+            return  # no introspectable signature (some builtins)
+        try:
+            signature.bind(*([0] * n_variables))
+        except TypeError as e:
+            raise ValueError(f"Target function does not accept {n_variables} arguments") from e
+        return
+    rows = 2 ** n_variables
+    if len(target) != rows:
+        raise ValueError(f"Target column has {len(target)} rows, expected {rows}")
+
+def evaluate_truth_table(program_str, variables, target=None):
     if not program_str:
         return 0.0
-    
-    def target_function(*args):
-        return sum(args) == 1
-    
+
+    check_target(target, len(variables))
+
+    target_function = target if callable(target) else default_target
+    columns = None if target is None or callable(target) else list(target)
+
     correct = 0
     total = 0
 
-    for combination in itertools.product([0, 1], repeat=len(variables)):
+    for row, combination in enumerate(itertools.product([0, 1], repeat=len(variables))):
         env = {var: bool(val) for var, val in zip(variables, combination)}
         
         tokens = program_str.split()
         result = evaluate_tokens(tokens, env)
         
         # Compare with target
-        target_result = target_function(*combination)
+        if columns is not None:
+            target_result = bool(columns[row])
+        else:
+            target_result = target_function(*combination)
         if result == target_result:
             correct += 1
         total += 1
@@ -25,6 +60,92 @@ def evaluate_truth_table(program_str, variables):
     
     return correct / total if total > 0 else 0.0
 
+class TruthTable:
+    """Caches each program's truth-table outputs as an int bitmask (bit i is
+    the output for row i of itertools.product([0, 1], repeat=n)), so a program
+    is evaluated once and then scored against any target with XOR + popcount.
+    Cached masks live as long as the table, and callable targets are kept
+    alive as cache keys; call clear() to release them between large runs.
+    """
+    def __init__(self, variables):
+        self.variables = list(variables)
+        self.rows = 2 ** len(self.variables)
+        self._outputs = {}
+        self._targets = {}
+
+    def output_mask(self, program_str):
+        mask = self._outputs.get(program_str)
+        if mask is None:
+            tokens = program_str.split()
+            mask = 0
+            for row, combination in enumerate(itertools.product([0, 1], repeat=len(self.variables))):
+                env = {var: bool(val) for var, val in zip(self.variables, combination)}
+                if evaluate_tokens(tokens, env):
+                    mask |= 1 << row
+            self._outputs[program_str] = mask
+        return mask
+
+    def target_mask(self, target=None):
+        """target: None (default function), a callable over the variable
+        values, or a column of 0/1 outputs with one entry per row."""
+        key = target if target is None or callable(target) else tuple(target)
+        mask = self._targets.get(key)
+        if mask is None:
+            check_target(target, len(self.variables))
+            mask = 0
+            if target is None or callable(target):
+                func = target or default_target
+                for row, combination in enumerate(itertools.product([0, 1], repeat=len(self.variables))):
+                    if func(*combination):
+                        mask |= 1 << row
+            else:
+                for row, value in enumerate(key):
+                    if value:
+                        mask |= 1 << row
+            self._targets[key] = mask
+        return mask
+
+    def add_variable(self, variable):
+        """Extend the table with a new last variable instead of rebuilding it.
+        A program that doesn't mention the new variable ignores it, so row r's
+        output just repeats in the new rows 2r and 2r+1. Programs that do
+        mention it were scored with it as False and are dropped instead.
+        Target masks are dropped and rebuilt on demand; column targets must be
+        extended by the caller."""
+        if variable in self.variables:
+            return
+        self.variables.append(variable)
+        self.rows *= 2
+        outputs = {}
+        for program_str, mask in self._outputs.items():
+            if variable in program_str.split():
+                continue
+            extended = 0
+            row = 0
+            while mask:
+                if mask & 1:
+                    extended |= 3 << (2 * row)
+                mask >>= 1
+                row += 1
+            outputs[program_str] = extended
+        self._outputs = outputs
+        self._targets = {}
+
+    def clear(self):
+        """Drop all cached program and target masks."""
+        self._outputs = {}
+        self._targets = {}
+
+    def accuracy(self, program_str, target=None, target_mask=None):
+        """target_mask, if given, is a precomputed target_mask(target) and
+        spares the per-call target lookup."""
+        if not program_str:
+            return 0.0
+        if target_mask is None:
+            target_mask = self.target_mask(target)
+        wrong = popcount(self.output_mask(program_str) ^ target_mask)
+        return (self.rows - wrong) / self.rows
+
 # Simple evaluator for bool expressions
 def evaluate_tokens(tokens, env):
     if len(tokens) == 1:
@@ -102,9 +223,13 @@ def measure_complexity(program_str):
     return op_count
 
 # Calculate fitness with complexity penalty, higher is better
-def fitness_with_penalty(program_str, variables, complexity_weight=0.1):
+def fitness_with_penalty(program_str, variables, complexity_weight=0.1, target=None, truth_table=None,
+                         target_mask=None):
     # Combine truth-table accuracy and heuristic program quality.
-    accuracy = evaluate_truth_table(program_str, variables)
+    if truth_table is not None:
+        accuracy = truth_table.accuracy(program_str, target, target_mask)
+    else:
+        accuracy = evaluate_truth_table(program_str, variables, target)
     quality = evaluate_program_quality(program_str, variables)
     complexity = measure_complexity(program_str)
 
@@ -1,29 +1,47 @@
 from grammar import Grammar
 from population import Population
-from fitness import fitness_with_penalty
+from fitness import fitness_with_penalty, check_target, TruthTable
 from utils import print_population_stats, save_results, calculate_complexity
 
 class GGGPSystem:
-    def __init__(self, variables=None, pop_size=100, complexity_weight=0.1):
+    def __init__(self, variables=None, pop_size=100, complexity_weight=0.1, target=None):
         self.variables = variables or ['A', 'B', 'C']
+        self.pop_size = pop_size
+        self.complexity_weight = complexity_weight
+        check_target(target, len(self.variables))
+        self.target = target
+
+        # Program outputs are cached here and shared by every target scored against them
+        self.truth_table = TruthTable(self.variables)
         
         # Initialize grammar with variables (use simple decoder for predictable mapping)
         self.grammar = Grammar(self.variables, simple=True)
         
         # Initialize fitness function with complexity penalty
         # Accept (prog, variables) signature used by Population/Individual
-        self.fitness_func = lambda prog, vars=None: fitness_with_penalty(prog, self.variables, complexity_weight)
+        self.fitness_func = self.make_fitness_func(target)
         
         # Initialize population
-        self.population = Population(
-            size=pop_size,
+        self.population = self.make_population(self.fitness_func)
+        
+        self.best_solution = None
+
+    def make_fitness_func(self, target=None):
+        # Resolve the target once; each call is then a cached lookup plus XOR
+        target_mask = self.truth_table.target_mask(target)
+        return lambda prog, vars=None: fitness_with_penalty(
+            prog, self.variables, self.complexity_weight,
+            target=target, truth_table=self.truth_table, target_mask=target_mask
+        )
+
+    def make_population(self, fitness_func):
+        return Population(
+            size=self.pop_size,
             grammar=self.grammar,
-            fitness_func=self.fitness_func,
+            fitness_func=fitness_func,
             variables=self.variables,
             elite_size=1
         )
-        
-        self.best_solution = None
     
     def run_evolution(self, generations=100):
         print("=" * 50)
@@ -60,10 +78,56 @@ class GGGPSystem:
         
         return self.best_solution
     
-    def add_variable(self, variable):
+    def run_multi_target(self, targets, generations=100):
+        """Evolve one population per target. Targets are callables or 0/1
+        truth-table columns; every distinct program's outputs are computed once
+        in the shared truth table and compared against each target.
+        Returns the best Individual for each target, in order.
+        Raises ValueError before evolving anything if a target doesn't fit.
+        """
+        for target in targets:
+            check_target(target, len(self.variables))
+
+        print("=" * 50)
+        print("Starting multi-target Grammar-Guided Genetic Programming")
+        print(f"Variables: {self.variables}")
+        print(f"Targets: {len(targets)}")
+        print(f"Population size: {self.pop_size}")
+        print("=" * 50)
+
+        best_per_target = []
+        for i, target in enumerate(targets):
+            population = self.make_population(self.make_fitness_func(target))
+            best = population.evolve(generations=generations)
+            best_per_target.append(best)
+            print(f"Target {i}: fitness {best.fitness:.3f}, program: {best.phenotype}")
+
+        return best_per_target
+
+    def add_variable(self, variable, target=None):
+        """Grow the variable set mid-run: cached program outputs are extended,
+        and the current population is re-decoded and re-scored in place.
+        A column target is extended with the new variable as its last column;
+        a callable must accept the new arity, otherwise pass a new target.
+        Raises ValueError, before changing anything, if the target won't fit.
+        """
+        is_new = variable not in self.variables
+        if target is None:
+            target = self.target
+            if is_new and target is not None and not callable(target):
+                # row r of the old table becomes rows 2r and 2r+1
+                target = [value for value in target for _ in range(2)]
+        check_target(target, len(self.variables) + is_new)
+
         self.grammar.add_variable(variable)
         if variable not in self.variables:
             self.variables.append(variable)
+        self.truth_table.add_variable(variable)
+
+        self.target = target
+        self.fitness_func = self.make_fitness_func(target)
+        self.population.fitness_func = self.fitness_func
+        self.population.refresh()
         print(f"Added variable: {variable}")
     
     def test_genotype_mapping(self, genotype=None):
@@ -31,17 +31,59 @@ class Grammar:
         self.rule_counts['<op>'] = len(combined_ops)
 
         self.start_symbol = '<expr>'
+        self._update_depth_tables()
     
+    # Minimum derivation depth of every non-terminal (terminals are depth 0)
+    # and of each of its productions, used by derive_genotype
+    def _update_depth_tables(self):
+        depths = {nt: float('inf') for nt in self.rules}
+        changed = True
+        while changed:
+            changed = False
+            for nt, productions in self.rules.items():
+                for production in productions:
+                    depth = 1 + max(depths.get(sym, 0) for sym in production.split())
+                    if depth < depths[nt]:
+                        depths[nt] = depth
+                        changed = True
+        self.min_depths = depths
+        self.production_depths = {
+            nt: [1 + max(depths.get(sym, 0) for sym in p.split()) for p in productions]
+            for nt, productions in self.rules.items()
+        }
+        # symbols of each production, in derivation order
+        self._expansions = {
+            nt: [p.split() for p in productions]
+            for nt, productions in self.rules.items()
+        }
+        # (symbol, depth, full) -> allowed production indices
+        self._derivation_choices = {}
+
+    def _choices_for(self, symbol, depth, full):
+        key = (symbol, depth, full)
+        choices = self._derivation_choices.get(key)
+        if choices is None:
+            productions = self.rules[symbol]
+            choices = [i for i, d in enumerate(self.production_depths[symbol]) if d <= depth]
+            if full:
+                recursive = [i for i in choices if symbol in productions[i].split()]
+                if recursive:
+                    choices = recursive
+            self._derivation_choices[key] = choices
+        return choices
+
     # Add a new terminal variable to the grammar
     def add_variable(self, variable):
         if variable not in self.rules['<term>']:
             self.rules['<term>'].append(variable)
             self.rule_counts['<term>'] = len(self.rules['<term>'])
+            self._update_depth_tables()
     
     # Set the terminal variables dynamically
     def set_variables(self, variables):
         self.rules['<term>'] = variables
         self.rule_counts['<term>'] = len(variables)
+        self._update_depth_tables()
     
     # Convert genotype to phenotype (program string)
     def genotype_to_phenotype(self, genotype):
@@ -158,4 +200,41 @@ class Grammar:
             curr = random.randint(0, 9)
             rand_genotype.append(curr)
 
-        return rand_genotype
\ No newline at end of file
+        return rand_genotype
+
+    # Random genotype that decodes to a fully expanded program of at most
+    # max_depth ('grow'), or recursing for as long as depth allows ('full')
+    def derive_genotype(self, max_depth=6, full=False):
+        return self.derive_program(max_depth, full)[0]
+
+    # Same as derive_genotype, also returning the phenotype built along the way
+    def derive_program(self, max_depth=6, full=False):
+        if self.simple:
+            genotype = self._simple_genotype()
+            return genotype, self.genotype_to_phenotype(genotype)
+
+        max_depth = max(max_depth, self.min_depths[self.start_symbol])
+        genotype = []
+        output = []
+
+        def expand(symbol, depth):
+            choice = random.choice(self._choices_for(symbol, depth, full))
+            genotype.append(choice)
+            for sym in self._expansions[symbol][choice]:
+                if sym in self.rules:
+                    expand(sym, depth - 1)
+                else:
+                    output.append(sym)
+
+        expand(self.start_symbol, max_depth)
+        return genotype, ' '.join(output)
+
+    # Random genotype for one of the simple decoder's three shapes
+    def _simple_genotype(self):
+        n_terms = len(self.rules['<term>'])
+        shape = random.randint(0, 2)
+        if shape == 0:
+            return [0, random.randrange(n_terms), random.randrange(len(self.rules['<op_bin>'])), random.randrange(n_terms)]
+        if shape == 1:
+            return [1, random.randrange(len(self.rules['<unop>'])), random.randrange(n_terms)]
+        return [2, random.randrange(n_terms)]
\ No newline at end of file
@@ -4,12 +4,23 @@ from fitness import measure_complexity
 import random
 
 class Individual:    
-    def __init__(self, genotype, grammar):
+    def __init__(self, genotype, grammar, phenotype=None):
         self.genotype = genotype
         self.grammar = grammar
-        self.phenotype = grammar.genotype_to_phenotype(genotype)
+        self._phenotype = phenotype
         self.fitness = 0.0
         self.complexity = 0
+
+    @property
+    def phenotype(self):
+        """Decoded lazily so a grammar change only costs a decode when used."""
+        if self._phenotype is None:
+            self._phenotype = self.grammar.genotype_to_phenotype(self.genotype)
+        return self._phenotype
+
+    def invalidate(self):
+        """Drop the cached phenotype after the grammar has changed."""
+        self._phenotype = None
     
     def evaluate(self, fitness_func, variables):
         """Evaluate individual's fitness."""
@@ -24,13 +35,15 @@ class Individual:
 
 # Manages population of individuals and evolution process.
 class Population:    
-    def __init__(self, size, grammar, fitness_func, variables, elite_size=2):
+    def __init__(self, size, grammar, fitness_func, variables, elite_size=2, max_depth=6):
         """Initialize population.
             size: Population size
             grammar: Grammar instance
             fitness_func: Fitness function
             variables: List of variables
             elite_size: Number of elite individuals to preserve
+            max_depth: Derivation depth ramped up to (one deeper level is tried
+                if distinct programs run out)
         """
         self.size = size
         self.grammar = grammar
@@ -38,23 +51,67 @@ class Population:
         self.variables = variables
         self.elite_size = elite_size
         
-        # Initialize population with useful seed patterns then random individuals
         self.individuals = []
-        seed_patterns = [
-            [1, 0, 0, 1],  # A AND B
-            [0, 0, 1, 0],  # A OR B
-            [1, 2, 0],     # NOT A
-            [1, 0, 2, 1],  # A AND C
-        ]
+        seen = set()
+
+        def add_distinct(genotype, phenotype=None):
+            ind = Individual(genotype, grammar, phenotype)
+            if ind.phenotype in seen:
+                return False
+            seen.add(ind.phenotype)
+            self.individuals.append(ind)
+            return True
+
+        if grammar.simple:
+            # Useful seed patterns (only meaningful for the simple decoder)
+            seed_patterns = [
+                [1, 0, 0, 1],  # A AND B
+                [0, 0, 1, 0],  # A OR B
+                [1, 2, 0],     # NOT A
+                [1, 0, 2, 1],  # A AND C
+            ]
+            for pat in seed_patterns:
+                if len(self.individuals) < size:
+                    add_distinct(pat)
 
-        for pat in seed_patterns:
-            if len(self.individuals) < size:
-                self.individuals.append(Individual(pat, grammar))
+            # Depth means nothing to the simple decoder: draw distinct programs
+            # until 50 draws in a row are duplicates, then pad
+            duplicates = 0
+            while len(self.individuals) < size and duplicates < 50:
+                if add_distinct(*grammar.derive_program()):
+                    duplicates = 0
+                else:
+                    duplicates += 1
+        else:
+            # Ramped half-and-half over derivation depths, skipping duplicate
+            # phenotypes. A depth that mostly produces duplicates is dropped from
+            # the ramp; once all are exhausted the ramp is extended one level
+            # deeper, at most once, to keep early programs from bloating
+            min_depth = grammar.min_depths[grammar.start_symbol]
+            depth_limit = max(max_depth, min_depth)
+            depth_cap = depth_limit + 1
+            depths = list(range(min_depth, depth_limit + 1))
+            duplicates = {}
+            attempts = 0
+            while len(self.individuals) < size:
+                if not depths:
+                    if depth_limit >= depth_cap:
+                        break
+                    depth_limit += 1
+                    depths = [depth_limit]
+                depth = depths[attempts % len(depths)]
+                full = (attempts // len(depths)) % 2 == 1
+                attempts += 1
+                if add_distinct(*grammar.derive_program(depth, full)):
+                    duplicates[depth] = max(duplicates.get(depth, 0) - 1, 0)
+                else:
+                    duplicates[depth] = duplicates.get(depth, 0) + 1
+                    if duplicates[depth] >= 50:
+                        depths.remove(depth)
 
-        # Fill rest randomly
-        for _ in range(size - len(self.individuals)):
-            genotype = grammar.get_random_genotype(length=15)
-            self.individuals.append(Individual(genotype, grammar))
+        # Grammar has fewer distinct programs than requested: pad with repeats
+        while len(self.individuals) < size:
+            self.individuals.append(Individual(grammar.derive_genotype(max_depth), grammar))
         
         self.generation = 0
         self.best_fitness = 0.0
@@ -70,6 +127,13 @@ class Population:
         
         return self.best_fitness
     
+    def refresh(self):
+        """Re-decode every individual against the current grammar and
+        re-score them in one pass, e.g. after a variable was added."""
+        for ind in self.individuals:
+            ind.invalidate()
+        return self.evaluate_all()
+    
     def selection(self):
         """Tournament selection."""
         tournament_size = 3
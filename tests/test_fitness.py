@@ -1,6 +1,6 @@
 
 import unittest
-from fitness import fitness_with_penalty, measure_complexity
+from fitness import fitness_with_penalty, measure_complexity, evaluate_truth_table, TruthTable
 
 class TestFitness(unittest.TestCase):
     def test_measure_complexity(self):
@@ -14,5 +14,50 @@ class TestFitness(unittest.TestCase):
         self.assertGreaterEqual(fitness, 0)
         self.assertLessEqual(fitness, 1)
 
+    def test_truth_table_matches_evaluator(self):
+        variables = ['A', 'B', 'C']
+        table = TruthTable(variables)
+        for prog in ['A', 'NOT B', 'A AND B', 'A OR NOT C']:
+            self.assertEqual(table.accuracy(prog), evaluate_truth_table(prog, variables))
+
+    def test_truth_table_column_targets(self):
+        table = TruthTable(['A', 'B'])
+        self.assertEqual(table.accuracy('A AND B', [0, 0, 0, 1]), 1.0)
+        self.assertEqual(table.accuracy('A AND B', [1, 1, 1, 0]), 0.0)
+        self.assertEqual(evaluate_truth_table('A OR B', ['A', 'B'], [0, 1, 1, 1]), 1.0)
+        with self.assertRaises(ValueError):
+            table.accuracy('A', [0, 1])
+        with self.assertRaises(ValueError):
+            evaluate_truth_table('A', ['A', 'B'], [0, 1])
+        with self.assertRaises(ValueError):
+            evaluate_truth_table('A', ['A', 'B'], [0, 1, 1, 1, 0])
+        with self.assertRaises(ValueError):
+            table.accuracy('A', lambda a: a)
+
+    def test_truth_table_clear(self):
+        table = TruthTable(['A', 'B'])
+        table.accuracy('A AND B')
+        table.clear()
+        self.assertEqual(table._outputs, {})
+        self.assertEqual(table._targets, {})
+        self.assertEqual(table.accuracy('A AND B'), evaluate_truth_table('A AND B', ['A', 'B']))
+
+    def test_truth_table_add_variable(self):
+        table = TruthTable(['A', 'B'])
+        for prog in ['A', 'NOT B', 'A AND B', 'A OR NOT B']:
+            table.output_mask(prog)
+        table.add_variable('C')
+        fresh = TruthTable(['A', 'B', 'C'])
+        for prog in ['A', 'NOT B', 'A AND B', 'A OR NOT B']:
+            self.assertEqual(table.output_mask(prog), fresh.output_mask(prog))
+            self.assertEqual(table.accuracy(prog), fresh.accuracy(prog))
+
+    def test_truth_table_add_variable_drops_programs_using_it(self):
+        table = TruthTable(['A', 'B'])
+        table.output_mask('A AND C')
+        table.add_variable('C')
+        self.assertNotIn('A AND C', table._outputs)
+        self.assertEqual(table.output_mask('A AND C'), TruthTable(['A', 'B', 'C']).output_mask('A AND C'))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
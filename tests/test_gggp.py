@@ -0,0 +1,113 @@
+import random
+import unittest
+from unittest import mock
+from gggp import GGGPSystem
+from population import Individual
+from fitness import fitness_with_penalty
+
+
+class CountingDict(dict):
+    """Records how many times each key is written."""
+    def __init__(self):
+        super().__init__()
+        self.writes = {}
+
+    def __setitem__(self, key, value):
+        self.writes[key] = self.writes.get(key, 0) + 1
+        super().__setitem__(key, value)
+
+
+class TestGGGPSystem(unittest.TestCase):
+    def test_target_parameter(self):
+        system = GGGPSystem(['A', 'B'], pop_size=10, target=[0, 0, 0, 1])
+        self.assertEqual(system.fitness_func('A AND B'),
+                         fitness_with_penalty('A AND B', ['A', 'B'], 0.1, target=[0, 0, 0, 1]))
+
+    def test_invalid_targets_raise(self):
+        with self.assertRaises(ValueError):
+            GGGPSystem(['A', 'B'], pop_size=10, target=[0, 1])
+        system = GGGPSystem(['A', 'B'], pop_size=10)
+        with self.assertRaises(ValueError):
+            system.run_multi_target([[0, 0, 0, 1], [0, 1, 1]], generations=1)
+        with self.assertRaises(ValueError):
+            system.run_multi_target([lambda a: a], generations=1)
+        self.assertEqual(system.truth_table._outputs, {})
+
+    def test_run_multi_target(self):
+        random.seed(0)
+        variables = ['A', 'B', 'C']
+        targets = [
+            [0, 0, 0, 0, 0, 0, 1, 1],   # A AND B
+            lambda a, b, c: a or c,
+            [1, 0, 1, 0, 1, 0, 1, 0],   # NOT C
+        ]
+        system = GGGPSystem(variables, pop_size=30, complexity_weight=0.02)
+        system.truth_table._outputs = CountingDict()
+
+        best = system.run_multi_target(targets, generations=5)
+
+        self.assertEqual(len(best), len(targets))
+        for ind, target in zip(best, targets):
+            self.assertIsInstance(ind, Individual)
+            self.assertAlmostEqual(ind.fitness,
+                                   fitness_with_penalty(ind.phenotype, variables, 0.02, target=target))
+            self.assertIn(ind.phenotype, system.truth_table._outputs)
+        # every program's outputs were computed exactly once across all targets
+        self.assertTrue(all(n == 1 for n in system.truth_table._outputs.writes.values()))
+
+    def test_add_variable_rescores_with_column_target(self):
+        random.seed(0)
+        system = GGGPSystem(['A', 'B'], pop_size=20, target=[0, 0, 0, 1])
+        system.population.evaluate_all()
+        cached = dict(system.truth_table._outputs)
+        self.assertTrue(cached)
+
+        system.add_variable('C')
+
+        extended = [0, 0, 0, 0, 0, 0, 1, 1]
+        self.assertEqual(system.target, extended)
+        for ind in system.population.individuals:
+            self.assertEqual(ind.fitness,
+                             fitness_with_penalty(ind.phenotype, ['A', 'B', 'C'], 0.1, target=extended))
+        self.assertEqual(system.fitness_func('A AND B'),
+                         fitness_with_penalty('A AND B', ['A', 'B', 'C'], 0.1, target=extended))
+
+        # previously cached outputs are extended, not re-evaluated
+        with mock.patch('fitness.evaluate_tokens', side_effect=AssertionError('re-evaluated')):
+            for program in cached:
+                system.truth_table.output_mask(program)
+
+    def test_add_variable_redecodes_phenotypes(self):
+        random.seed(0)
+        system = GGGPSystem(['A', 'B'], pop_size=20)
+        system.population.evaluate_all()
+        before = [ind.phenotype for ind in system.population.individuals]
+        system.fitness_func('C')  # cached while C was still unknown
+
+        system.add_variable('C')
+
+        after = [ind.phenotype for ind in system.population.individuals]
+        self.assertNotEqual(before, after)
+        for ind in system.population.individuals:
+            self.assertEqual(ind.phenotype, system.grammar.genotype_to_phenotype(ind.genotype))
+        # a program naming the new variable is scored as if the system had always had it
+        fresh = GGGPSystem(['A', 'B', 'C'], pop_size=2)
+        self.assertEqual(system.fitness_func('C'), fresh.fitness_func('C'))
+
+    def test_add_variable_callable_target(self):
+        system = GGGPSystem(['A', 'B'], pop_size=10, target=lambda a, b: a and b)
+        system.population.evaluate_all()
+        with self.assertRaises(ValueError):
+            system.add_variable('C')
+        self.assertEqual(system.variables, ['A', 'B'])
+        self.assertEqual(system.truth_table.rows, 4)
+
+        system.add_variable('C', target=lambda a, b, c: a and b)
+        for ind in system.population.individuals:
+            self.assertEqual(ind.fitness,
+                             fitness_with_penalty(ind.phenotype, ['A', 'B', 'C'], 0.1,
+                                                  target=lambda a, b, c: a and b))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -25,5 +25,29 @@ class TestGrammar(unittest.TestCase):
         self.assertTrue(self.grammar.is_valid_program('A OR B'))
         self.assertFalse(self.grammar.is_valid_program('A FOO B'))
 
+    def test_min_depths(self):
+        self.assertEqual(self.grammar.min_depths['<term>'], 1)
+        self.assertEqual(self.grammar.min_depths['<expr>'], 2)
+
+    def test_derive_program(self):
+        grammar = Grammar(['A', 'B', 'C'], simple=False)
+        for i in range(50):
+            genotype, phenotype = grammar.derive_program(max_depth=5, full=i % 2 == 1)
+            self.assertEqual(grammar.genotype_to_phenotype(genotype), phenotype)
+            self.assertTrue(grammar.is_valid_program(phenotype))
+
+    def test_derive_program_mixed_productions(self):
+        grammar = Grammar(['A', 'B'], simple=False)
+        grammar.rules['<expr>'] = ['<expr> XOR <expr>', '( <expr> )', '<term>']
+        grammar._update_depth_tables()
+        phenotypes = set()
+        for i in range(50):
+            genotype, phenotype = grammar.derive_program(max_depth=4, full=i % 2 == 1)
+            self.assertEqual(grammar.genotype_to_phenotype(genotype), phenotype)
+            phenotypes.add(phenotype)
+        tokens = set(' '.join(phenotypes).split())
+        self.assertIn('XOR', tokens)
+        self.assertIn('(', tokens)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
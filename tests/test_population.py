@@ -20,10 +20,35 @@ class TestPopulation(unittest.TestCase):
         pop = Population(10, self.grammar, self.fitness_func, ['A', 'B'])
         self.assertEqual(len(pop.individuals), 10)
     
+    def test_initialization_distinct_programs(self):
+        grammar = Grammar(['A', 'B', 'C'], simple=False)
+        pop = Population(200, grammar, self.fitness_func, ['A', 'B', 'C'])
+        phenotypes = [ind.phenotype for ind in pop.individuals]
+        self.assertEqual(len(set(phenotypes)), 200)
+        self.assertTrue(all(grammar.is_valid_program(p) for p in phenotypes))
+    
+    def test_initialization_simple_grammar(self):
+        calls = []
+        derive_program = self.grammar.derive_program
+        self.grammar.derive_program = lambda *args: calls.append(args) or derive_program(*args)
+        pop = Population(100, self.grammar, self.fitness_func, self.variables)
+        self.assertEqual(len(pop.individuals), 100)
+        # the simple decoder only has a handful of distinct programs
+        self.assertLess(len(calls), 200)
+    
     def test_evaluation(self):
         pop = Population(5, self.grammar, self.fitness_func, ['A', 'B'])
         best = pop.evaluate_all()
         self.assertIsInstance(best, float)
 
+    def test_refresh_rescores(self):
+        pop = Population(5, self.grammar, self.fitness_func, self.variables)
+        pop.evaluate_all()
+        for ind in pop.individuals:
+            ind.fitness = -1.0
+        pop.refresh()
+        for ind in pop.individuals:
+            self.assertEqual(ind.fitness, self.fitness_func(ind.phenotype, self.variables))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file